@@ -1,5 +1,5 @@
 import { Composer } from 'grammy';
-import { formatNumber } from '../../utils/helpers.js';
+import { formatNumber, isOwnerId } from '../../utils/helpers.js';
 import { getRegisteredModules } from '../plugin-system.js';
 import { getFeatureFlags } from '../../services/feature-flags/index.js';
 import { getLogger } from '../../services/logger/index.js';
@@ -8,6 +8,31 @@ import type { Env } from '../../types/env.js';
 const logger = getLogger({ module: 'commands' });
 const bot = new Composer();
 
+// Static texts and keyboards are built once per isolate, not per update
+const START_KEYBOARD = {
+  inline_keyboard: [
+    [{ text: 'AI Chat', callback_data: 'menu:ai' }, { text: 'Download', callback_data: 'menu:download' }],
+    [{ text: 'Music', callback_data: 'menu:music' }, { text: 'Image Search', callback_data: 'menu:image' }],
+    [{ text: 'Finance', callback_data: 'menu:finance' }, { text: 'Space', callback_data: 'menu:space' }],
+    [{ text: 'Games', callback_data: 'menu:games' }],
+  ],
+};
+
+const MENU_REPLIES: Record<string, string> = {
+  ai: 'AI Chat\n\nSend /ai <message> to start chatting!\nOr just send me any text message.',
+  download: 'Downloader\n\nSend /download <url> or just paste a link!\nSupported: YouTube, Instagram, TikTok, Twitter, Reddit, and more.',
+  music: 'Music Search\n\n/music <song name> - Search songs\n/lyrics <song name> - Get lyrics',
+  image: 'Image Search\n\n/image <query> - Search images\n/pin <query> - Search Pinterest\n\nProviders: Pinterest, Pexels, Pixabay, Unsplash, Wikimedia',
+  finance: 'Finance\n\n/currency - Exchange rates\n/gold - Gold prices\n/crypto <coin> - Crypto prices',
+  space: 'Space\n\n/apod - Astronomy Picture of the Day\n/spacex - Latest launch\n/mars - Mars Rover photos',
+  games: 'Gaming\n\n/freegames - Free games on Epic Store',
+};
+
+const HELP_TEXT = {
+  fa: `راهنمای ایکول\n\nهوش مصنوعی:\n/ai - چت با AI\n/model - تغییر مدل\n clears - پاک کردن تاریخچه\n\nدانلود:\n/download - دانلود از لینک\nیا لینک بفرستید!\n\nموسیقی:\n/music - جستجو\n/lyrics - متن آهنگ\n\nتصویر:\n/image - جستجوی تصویر\n/pin - جستجوی پینترست\n\nمالی:\n/currency - نرخ ارز\n/gold - طلا\n/crypto - ارز دیجیتال\n\nفضا:\n/apod - تصویر نجومی\n/spacex - آخرین پرتاب\n/mars - مریخ\n\nبازی:\n/freegames - بازی رایگان\n\nابزارها:\n/weather - آب و هوا\n/qr - کد QR\n/translate - ترجمه\n/wiki - ویکیپدیا\n/password - رمز عبور\n\nسایر:\n/today - مناسبت امروز\n/randomfact - حقیقت جالب\n/quote - جمله الهامبخش\n/stats - آمار`,
+  en: `Ikol Help\n\nAI:\n/ai <msg> - Chat with AI\n/model - Change AI model\n/clear - Clear history\n\nDownloads:\n/download <url> - Download\nOr just send a link!\n\nMusic:\n/music <query> - Search\n/lyrics <query> - Get lyrics\n\nImages:\n/image <query> - Search images\n/pin <query> - Pinterest search\n\nFinance:\n/currency - Exchange rates\n/gold - Gold prices\n/crypto <coin> - Crypto\n\nSpace:\n/apod - Astronomy Picture\n/spacex - Latest launch\n/mars - Mars photos\n\nGaming:\n/freegames - Free games\n\nUtilities:\n/weather <city> - Weather\n/qr <text> - QR code\n/translate <text> - Translate\n/wiki <topic> - Wikipedia\n/password - Generate password\n\nOther:\n/today - Today's fun days\n/randomfact - Fun fact\n/quote - Motivational quote\n/stats - Bot statistics`,
+};
+
 bot.command('start', async (ctx) => {
   logger.info('/start triggered', {
     userId: ctx.from?.id,
@@ -24,14 +49,7 @@ bot.command('start', async (ctx) => {
 
   try {
     const reply = await ctx.reply(welcome, {
-      reply_markup: {
-        inline_keyboard: [
-          [{ text: 'AI Chat', callback_data: 'menu:ai' }, { text: 'Download', callback_data: 'menu:download' }],
-          [{ text: 'Music', callback_data: 'menu:music' }, { text: 'Image Search', callback_data: 'menu:image' }],
-          [{ text: 'Finance', callback_data: 'menu:finance' }, { text: 'Space', callback_data: 'menu:space' }],
-          [{ text: 'Games', callback_data: 'menu:games' }],
-        ],
-      },
+      reply_markup: START_KEYBOARD,
     });
     logger.info('/start reply sent', {
       userId: ctx.from?.id,
@@ -51,23 +69,12 @@ bot.command('start', async (ctx) => {
 bot.callbackQuery(/^menu:(.+)$/, async (ctx) => {
   await ctx.answerCallbackQuery();
   const section = ctx.match[1];
-  const replies: Record<string, string> = {
-    ai: 'AI Chat\n\nSend /ai <message> to start chatting!\nOr just send me any text message.',
-    download: 'Downloader\n\nSend /download <url> or just paste a link!\nSupported: YouTube, Instagram, TikTok, Twitter, Reddit, and more.',
-    music: 'Music Search\n\n/music <song name> - Search songs\n/lyrics <song name> - Get lyrics',
-    image: 'Image Search\n\n/image <query> - Search images\n/pin <query> - Search Pinterest\n\nProviders: Pinterest, Pexels, Pixabay, Unsplash, Wikimedia',
-    finance: 'Finance\n\n/currency - Exchange rates\n/gold - Gold prices\n/crypto <coin> - Crypto prices',
-    space: 'Space\n\n/apod - Astronomy Picture of the Day\n/spacex - Latest launch\n/mars - Mars Rover photos',
-    games: 'Gaming\n\n/freegames - Free games on Epic Store',
-  };
-  await ctx.reply(replies[section] || 'Unknown section');
+  await ctx.reply(MENU_REPLIES[section] || 'Unknown section');
 });
 
 bot.command('help', async (ctx) => {
   const lang = (ctx as any).language || 'en';
-  const msg = lang === 'fa'
-    ? `راهنمای ایکول\n\nهوش مصنوعی:\n/ai - چت با AI\n/model - تغییر مدل\n clears - پاک کردن تاریخچه\n\nدانلود:\n/download - دانلود از لینک\nیا لینک بفرستید!\n\nموسیقی:\n/music - جستجو\n/lyrics - متن آهنگ\n\nتصویر:\n/image - جستجوی تصویر\n/pin - جستجوی پینترست\n\nمالی:\n/currency - نرخ ارز\n/gold - طلا\n/crypto - ارز دیجیتال\n\nفضا:\n/apod - تصویر نجومی\n/spacex - آخرین پرتاب\n/mars - مریخ\n\nبازی:\n/freegames - بازی رایگان\n\nابزارها:\n/weather - آب و هوا\n/qr - کد QR\n/translate - ترجمه\n/wiki - ویکیپدیا\n/password - رمز عبور\n\nسایر:\n/today - مناسبت امروز\n/randomfact - حقیقت جالب\n/quote - جمله الهامبخش\n/stats - آمار`
-    : `Ikol Help\n\nAI:\n/ai <msg> - Chat with AI\n/model - Change AI model\n/clear - Clear history\n\nDownloads:\n/download <url> - Download\nOr just send a link!\n\nMusic:\n/music <query> - Search\n/lyrics <query> - Get lyrics\n\nImages:\n/image <query> - Search images\n/pin <query> - Pinterest search\n\nFinance:\n/currency - Exchange rates\n/gold - Gold prices\n/crypto <coin> - Crypto\n\nSpace:\n/apod - Astronomy Picture\n/spacex - Latest launch\n/mars - Mars photos\n\nGaming:\n/freegames - Free games\n\nUtilities:\n/weather <city> - Weather\n/qr <text> - QR code\n/translate <text> - Translate\n/wiki <topic> - Wikipedia\n/password - Generate password\n\nOther:\n/today - Today's fun days\n/randomfact - Fun fact\n/quote - Motivational quote\n/stats - Bot statistics`;
+  const msg = HELP_TEXT[lang === 'fa' ? 'fa' : 'en'];
   await ctx.reply(msg);
 });
 
@@ -97,10 +104,9 @@ bot.command('stats', async (ctx) => {
 
 bot.command('debug', async (ctx) => {
   const env = (ctx as any).env as Env | undefined;
-  const ownerIds = env?.OWNER_IDS?.split(',').map(id => id.trim()) || [];
-  const userId = ctx.from?.id?.toString();
+  const isOwner = isOwnerId(ctx.from?.id, env?.OWNER_IDS);
 
-  if (!userId || !ownerIds.includes(userId)) {
+  if (!isOwner) {
     await ctx.reply('Access denied. Owner only.');
     return;
   }
@@ -157,10 +163,9 @@ bot.command('debug', async (ctx) => {
 
 bot.command('trace', async (ctx) => {
   const env = (ctx as any).env as Env | undefined;
-  const ownerIds = env?.OWNER_IDS?.split(',').map(id => id.trim()) || [];
-  const userId = ctx.from?.id?.toString();
+  const isOwner = isOwnerId(ctx.from?.id, env?.OWNER_IDS);
 
-  if (!userId || !ownerIds.includes(userId)) {
+  if (!isOwner) {
     await ctx.reply('Access denied. Owner only.');
     return;
   }
@@ -199,7 +204,7 @@ bot.command('trace', async (ctx) => {
   traceLines.push(`   Chat ID: ${ctx.chat?.id}`);
   traceLines.push(`   Chat Type: ${ctx.chat?.type}`);
   traceLines.push(`   Message ID: ${ctx.message?.message_id}`);
-  traceLines.push(`   Is Owner: ${ownerIds.includes(userId)}`);
+  traceLines.push(`   Is Owner: ${isOwner}`);
   traceLines.push('');
 
   // 4. Modules
@@ -19,6 +19,8 @@ export interface IkolContext extends Context {
   language: string;
   isAdmin: boolean;
   requestId: string;
+  // Users row loaded once per update by userMiddleware (null for new users, unset if the read failed)
+  dbUser?: any;
 }
 
 export function envMiddleware(env: Env) {
@@ -28,19 +30,30 @@ export function envMiddleware(env: Env) {
   };
 }
 
+// Services are reused across updates in the same isolate (and keep their L1 state);
+// they are rebuilt only when the bindings change
+let sharedDb: { binding: D1Database; service: DatabaseService } | null = null;
+let sharedKv: { binding: KVNamespace | null; cache: TieredCache; rateLimiter: RateLimiter | null } | null = null;
+
 export function servicesMiddleware() {
   return async (ctx: Context, next: NextFunction) => {
     const env = (ctx as any).env as Env;
     if (env?.DB) {
-      (ctx as any).db = new DatabaseService(env.DB);
+      if (sharedDb?.binding !== env.DB) {
+        sharedDb = { binding: env.DB, service: new DatabaseService(env.DB) };
+      }
+      (ctx as any).db = sharedDb.service;
     }
-    if (env?.KV) {
-      (ctx as any).cache = new TieredCache(env.KV);
-      (ctx as any).rateLimiter = new RateLimiter(env.KV);
-    } else {
-      (ctx as any).cache = new TieredCache(null);
-      (ctx as any).rateLimiter = null;
+    const kv = env?.KV ?? null;
+    if (!sharedKv || sharedKv.binding !== kv) {
+      sharedKv = {
+        binding: kv,
+        cache: new TieredCache(kv),
+        rateLimiter: kv ? new RateLimiter(kv) : null,
+      };
     }
+    (ctx as any).cache = sharedKv.cache;
+    (ctx as any).rateLimiter = sharedKv.rateLimiter;
     await next();
   };
 }
@@ -63,7 +76,9 @@ export function userMiddleware() {
       const db = (ctx as any).db as DatabaseService | null;
       if (db) {
         try {
-          const existingUser = await db.getUser(user.id);
+          // findUser throws on D1 errors, leaving dbUser unset so handlers re-read it
+          const existingUser = await db.findUser(user.id);
+          (ctx as any).dbUser = existingUser ?? null;
           if (!existingUser) {
             await db.createUser(user.id, user.username, user.first_name, user.last_name);
           } else {
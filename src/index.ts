@@ -3,6 +3,7 @@ import type { Env } from './types/env.js';
 import { getLogger, generateRequestId } from './services/logger/index.js';
 import { metrics } from './services/metrics/index.js';
 import { runStartupVerification } from './services/startup/index.js';
+import { readBodyCapped } from './utils/helpers.js';
 
 const logger = getLogger({ module: 'worker' });
 
@@ -33,8 +34,84 @@ function safeCompare(a: string, b: string): boolean {
   return result === 0;
 }
 
+// Root status page: body and headers built once; edge compression is applied by Cloudflare
+const ROOT_BODY = 'Ikol Bot v2.0 is running!';
+const ROOT_ETAG = '"ikol-root-2.0"';
+const ROOT_HEADERS = {
+  'Content-Type': 'text/plain; charset=utf-8',
+  'Cache-Control': 'public, max-age=3600',
+  'ETag': ROOT_ETAG,
+};
+
+// Fixed plain-text responses, built from a precomputed body/init table.
+// A Response body can only be consumed once, so a fresh Response wraps the shared parts.
+const TEXT_HEADERS = { 'Content-Type': 'text/plain; charset=utf-8' };
+const STATIC_RESPONSES = {
+  notFound: ['Not found', { status: 404, headers: TEXT_HEADERS }],
+  methodNotAllowed: ['Method not allowed', { status: 405, headers: TEXT_HEADERS }],
+  invalidContentType: ['Invalid content type', { status: 415, headers: TEXT_HEADERS }],
+  payloadTooLarge: ['Payload too large', { status: 413, headers: TEXT_HEADERS }],
+  unauthorized: ['Unauthorized', { status: 401, headers: TEXT_HEADERS }],
+  emptyBody: ['Empty body', { status: 400, headers: TEXT_HEADERS }],
+  invalidJson: ['Invalid JSON', { status: 400, headers: TEXT_HEADERS }],
+  ok: ['OK', { status: 200, headers: TEXT_HEADERS }],
+} satisfies Record<string, [string, ResponseInit]>;
+
+function staticResponse(name: keyof typeof STATIC_RESPONSES): Response {
+  const [body, init] = STATIC_RESPONSES[name];
+  return new Response(body, init);
+}
+
+// GET routes, dispatched with a single lookup on the pathname
+type GetHandler = (request: Request, env: Env, requestId: string) => Response | Promise<Response>;
+
+const GET_ROUTES = new Map<string, GetHandler>(Object.entries({
+  '/health': async (_request: Request, env: Env) => {
+    const report = await runStartupVerification(env);
+    const errors = report.filter(c => c.status === 'error').length;
+    return Response.json({
+      status: errors > 0 ? 'degraded' : 'ok',
+      bot: 'Ikol',
+      version: '2.1.0',
+      uptime: Date.now(),
+      checks: report.length,
+      errors,
+      details: report.map(c => ({ name: c.name, status: c.status, message: c.message })),
+    });
+  },
+  '/metrics': () => {
+    const snap = metrics.getSnapshot();
+    return Response.json({
+      uptime: snap.uptime,
+      requests: snap.requests,
+      users: { active: snap.users.active.size, daily: snap.users.daily.size },
+      providers: snap.providers,
+      cache: snap.cache,
+      errors: snap.errors.total,
+    });
+  },
+  '/': (request: Request) => {
+    if (request.headers.get('if-none-match') === ROOT_ETAG) {
+      return new Response(null, { status: 304, headers: ROOT_HEADERS });
+    }
+    return new Response(ROOT_BODY, { status: 200, headers: ROOT_HEADERS });
+  },
+  // DIAGNOSTIC: Test endpoint - confirms the worker is reachable
+  '/test': (_request: Request, _env: Env, requestId: string) => {
+    logger.info('TEST ENDPOINT HIT', { requestId });
+    return Response.json({
+      status: 'ok',
+      message: 'Worker is reachable',
+      timestamp: Date.now(),
+      version: '2.1.0',
+    });
+  },
+}));
+
 // Content-Type validation
 const TELEGRAM_CONTENT_TYPE = 'application/json';
+// Telegram updates are a few KB; anything larger is rejected before the body is read
+const MAX_BODY_BYTES = 1024 * 1024;
 
 export default {
   async fetch(request: Request, env: Env, ctx: ExecutionContext): Promise<Response> {
@@ -55,58 +132,28 @@ export default {
       userAgent: request.headers.get('user-agent')?.substring(0, 50),
     });
 
-    // Health check endpoints
+    // GET endpoints (health, metrics, status page, diagnostics)
     if (request.method === 'GET') {
-      if (url.pathname === '/health') {
-        const report = await runStartupVerification(env);
-        const errors = report.filter(c => c.status === 'error').length;
-        return Response.json({
-          status: errors > 0 ? 'degraded' : 'ok',
-          bot: 'Ikol',
-          version: '2.1.0',
-          uptime: Date.now(),
-          checks: report.length,
-          errors,
-          details: report.map(c => ({ name: c.name, status: c.status, message: c.message })),
-        });
-      }
-      if (url.pathname === '/metrics') {
-        const snap = metrics.getSnapshot();
-        return Response.json({
-          uptime: snap.uptime,
-          requests: snap.requests,
-          users: { active: snap.users.active.size, daily: snap.users.daily.size },
-          providers: snap.providers,
-          cache: snap.cache,
-          errors: snap.errors.total,
-        });
-      }
-      if (url.pathname === '/') {
-        return new Response('Ikol Bot v2.0 is running!', { status: 200 });
-      }
-      return new Response('Not found', { status: 404 });
-    }
-
-    // DIAGNOSTIC: Test endpoint - simulate Telegram update
-    if (request.method === 'GET' && url.pathname === '/test') {
-      logger.info('TEST ENDPOINT HIT', { requestId });
-      return Response.json({
-        status: 'ok',
-        message: 'Worker is reachable',
-        timestamp: Date.now(),
-        version: '2.1.0',
-      });
+      const handler = GET_ROUTES.get(url.pathname);
+      return handler ? handler(request, env, requestId) : staticResponse('notFound');
     }
 
     // Only handle POST for Telegram webhooks
     if (request.method !== 'POST') {
-      return new Response('Method not allowed', { status: 405 });
+      return staticResponse('methodNotAllowed');
     }
 
     // Content-Type validation
     const contentType = request.headers.get('content-type');
     if (!contentType?.includes(TELEGRAM_CONTENT_TYPE)) {
-      return new Response('Invalid content type', { status: 415 });
+      return staticResponse('invalidContentType');
+    }
+
+    // Body size limit (declared length)
+    const contentLength = Number(request.headers.get('content-length') || 0);
+    if (contentLength > MAX_BODY_BYTES) {
+      logger.warn('Webhook body too large', { requestId, contentLength });
+      return staticResponse('payloadTooLarge');
     }
 
     // Webhook secret verification (timing-safe)
@@ -114,7 +161,7 @@ export default {
       const secretToken = request.headers.get('X-Telegram-Bot-Api-Secret-Token');
       if (!secretToken || !safeCompare(secretToken, env.BOT_WEBHOOK_SECRET)) {
         logger.warn('Webhook unauthorized', { requestId, status: 'error' });
-        return new Response('Unauthorized', { status: 401 });
+        return staticResponse('unauthorized');
       }
     }
 
@@ -153,9 +200,9 @@ export default {
       if (!bot.botInfo) {
         try {
           logger.info('Loading bot info', { requestId });
-          const botInfoStr = await env.KV.get('bot_info');
-          if (botInfoStr) {
-            bot.botInfo = JSON.parse(botInfoStr);
+          const botInfo = await env.KV.get<typeof bot.botInfo>('bot_info', 'json');
+          if (botInfo) {
+            bot.botInfo = botInfo;
             logger.info('Bot info loaded from KV', { requestId, botId: bot.botInfo?.id });
           } else {
             logger.info('Fetching bot info from Telegram', { requestId });
@@ -170,14 +217,18 @@ export default {
       }
 
       // Parse update
-      const body = await request.text();
-      if (!body) return new Response('Empty body', { status: 400 });
+      const body = await readBodyCapped(request, MAX_BODY_BYTES);
+      if (body === null) {
+        logger.warn('Webhook body too large', { requestId });
+        return staticResponse('payloadTooLarge');
+      }
+      if (!body) return staticResponse('emptyBody');
 
       let update: any;
       try {
         update = JSON.parse(body);
       } catch {
-        return new Response('Invalid JSON', { status: 400 });
+        return staticResponse('invalidJson');
       }
 
       // Deduplicate updates (Telegram may send same update twice)
@@ -185,7 +236,7 @@ export default {
       if (updateId) {
         if (processedUpdates.has(updateId)) {
           logger.debug('Duplicate update', { requestId, updateId });
-          return new Response('OK', { status: 200 });
+          return staticResponse('ok');
         }
         processedUpdates.set(updateId, Date.now());
       }
@@ -201,14 +252,6 @@ export default {
       metrics.recordRequest(updateType, true);
       if (userId) metrics.recordUser(userId);
 
-      logger.info('Update received', {
-        requestId,
-        updateId,
-        userId,
-        updateType,
-        text: String(text).substring(0, 60),
-      });
-
       // Process update
       logger.info('Processing update', {
         requestId,
@@ -225,7 +268,6 @@ export default {
 
       try {
         await bot.handleUpdate(update);
-        logger.info('handleUpdate completed', { requestId, updateId, userId });
       } catch (handleError) {
         logger.error('handleUpdate FAILED', {
           requestId,
@@ -248,7 +290,7 @@ export default {
         status: 'success',
       });
 
-      return new Response('OK', { status: 200 });
+      return staticResponse('ok');
     } catch (error) {
       const duration = Date.now() - start;
       metrics.recordRequest('error', false);
@@ -262,7 +304,7 @@ export default {
         stack: (error as Error).stack,
       });
       // Always return 200 to Telegram to prevent retries
-      return new Response('OK', { status: 200 });
+      return staticResponse('ok');
     }
   },
 };
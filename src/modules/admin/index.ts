@@ -8,21 +8,13 @@ import type { Env } from '../../types/env.js';
 import type { FeatureFlags } from '../../services/feature-flags/index.js';
 import type { IkolModule } from '../../bot/plugin-system.js';
 import { registerModule } from '../../bot/plugin-system.js';
+import { isOwnerId } from '../../utils/helpers.js';
 
 const logger = getLogger({ module: 'admin' });
 
-// Owner ID — set via env or hardcoded for now
-const OWNER_IDS = new Set<number>();
-
+// Owner IDs come from the OWNER_IDS env var (comma-separated)
 function isOwner(userId: number, env: Env): boolean {
-  // Check env var for owner IDs (comma-separated)
-  if (OWNER_IDS.size === 0 && env.OWNER_IDS) {
-    env.OWNER_IDS.split(',').forEach(id => {
-      const num = parseInt(id.trim(), 10);
-      if (!isNaN(num)) OWNER_IDS.add(num);
-    });
-  }
-  return OWNER_IDS.has(userId);
+  return isOwnerId(userId, env.OWNER_IDS);
 }
 
 function formatUptime(ms: number): string {
@@ -15,10 +15,38 @@ interface AiProvider {
   chatStream?(messages: { role: string; content: string }[], model: string): AsyncGenerator<string>;
 }
 
-function withTimeout<T>(promise: Promise<T>, ms: number): Promise<T> {
+// Abort the request if response headers haven't arrived within `ms`.
+// Connection reuse (keep-alive) is handled by the Workers runtime.
+function fetchWithTimeout(url: string, init: RequestInit, ms: number): Promise<Response> {
   const controller = new AbortController();
   const timeout = setTimeout(() => controller.abort(), ms);
-  return promise.finally(() => clearTimeout(timeout));
+  return fetch(url, { ...init, signal: controller.signal }).finally(() => clearTimeout(timeout));
+}
+
+// Yield the payload of each `data:` line from a server-sent events response
+async function* readSseData(res: Response): AsyncGenerator<string> {
+  const reader = res.body?.getReader();
+  if (!reader) return;
+  const decoder = new TextDecoder();
+  let buf = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buf += decoder.decode(value, { stream: true });
+    const lines = buf.split('\n');
+    buf = lines.pop() || '';
+    for (const line of lines) {
+      if (line.startsWith('data: ')) yield line.slice(6);
+    }
+  }
+}
+
+// OpenAI-compatible chat completion stream (OpenAI, OpenRouter)
+async function* readChatCompletionStream(res: Response): AsyncGenerator<string> {
+  for await (const d of readSseData(res)) {
+    if (d === '[DONE]') return;
+    try { yield JSON.parse(d).choices?.[0]?.delta?.content || ''; } catch {}
+  }
 }
 
 // OpenAI Provider
@@ -27,41 +55,24 @@ class OpenAiProvider implements AiProvider {
   constructor(private apiKey: string) {}
 
   async chat(messages: { role: string; content: string }[], model: string): Promise<string> {
-    const res = await withTimeout(fetch('https://api.openai.com/v1/chat/completions', {
+    const res = await fetchWithTimeout('https://api.openai.com/v1/chat/completions', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${this.apiKey}` },
       body: JSON.stringify({ model: model || 'gpt-3.5-turbo', messages, max_tokens: 2048 }),
-    }), 25000);
+    }, 25000);
     if (!res.ok) throw new Error(`OpenAI ${res.status}`);
     const data = await res.json() as any;
     return data.choices?.[0]?.message?.content || '';
   }
 
   async *chatStream(messages: { role: string; content: string }[], model: string): AsyncGenerator<string> {
-    const res = await withTimeout(fetch('https://api.openai.com/v1/chat/completions', {
+    const res = await fetchWithTimeout('https://api.openai.com/v1/chat/completions', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${this.apiKey}` },
       body: JSON.stringify({ model: model || 'gpt-3.5-turbo', messages, stream: true, max_tokens: 2048 }),
-    }), 25000);
+    }, 25000);
     if (!res.ok) throw new Error(`OpenAI stream ${res.status}`);
-    const reader = res.body?.getReader();
-    if (!reader) return;
-    const decoder = new TextDecoder();
-    let buf = '';
-    while (true) {
-      const { done, value } = await reader.read();
-      if (done) break;
-      buf += decoder.decode(value, { stream: true });
-      const lines = buf.split('\n');
-      buf = lines.pop() || '';
-      for (const line of lines) {
-        if (line.startsWith('data: ')) {
-          const d = line.slice(6);
-          if (d === '[DONE]') return;
-          try { yield JSON.parse(d).choices?.[0]?.delta?.content || ''; } catch {}
-        }
-      }
-    }
+    yield* readChatCompletionStream(res);
   }
 }
 
@@ -83,7 +94,7 @@ class GeminiProvider implements AiProvider {
 
   async chat(messages: { role: string; content: string }[], model: string): Promise<string> {
     const name = model || 'gemini-1.5-flash';
-    const res = await withTimeout(fetch(
+    const res = await fetchWithTimeout(
       `https://generativelanguage.googleapis.com/v1beta/models/${name}:generateContent`,
       {
         method: 'POST',
@@ -92,8 +103,9 @@ class GeminiProvider implements AiProvider {
           'x-goog-api-key': this.apiKey,
         },
         body: JSON.stringify(this.buildBody(messages)),
-      }
-    ), 25000);
+      },
+      25000
+    );
     if (!res.ok) throw new Error(`Gemini ${res.status}`);
     const data = await res.json() as any;
     return data.candidates?.[0]?.content?.parts?.[0]?.text || '';
@@ -101,7 +113,7 @@ class GeminiProvider implements AiProvider {
 
   async *chatStream(messages: { role: string; content: string }[], model: string): AsyncGenerator<string> {
     const name = model || 'gemini-1.5-flash';
-    const res = await withTimeout(fetch(
+    const res = await fetchWithTimeout(
       `https://generativelanguage.googleapis.com/v1beta/models/${name}:streamGenerateContent?alt=sse`,
       {
         method: 'POST',
@@ -110,24 +122,12 @@ class GeminiProvider implements AiProvider {
           'x-goog-api-key': this.apiKey,
         },
         body: JSON.stringify(this.buildBody(messages)),
-      }
-    ), 25000);
+      },
+      25000
+    );
     if (!res.ok) throw new Error(`Gemini stream ${res.status}`);
-    const reader = res.body?.getReader();
-    if (!reader) return;
-    const decoder = new TextDecoder();
-    let buf = '';
-    while (true) {
-      const { done, value } = await reader.read();
-      if (done) break;
-      buf += decoder.decode(value, { stream: true });
-      const lines = buf.split('\n');
-      buf = lines.pop() || '';
-      for (const line of lines) {
-        if (line.startsWith('data: ')) {
-          try { yield JSON.parse(line.slice(6)).candidates?.[0]?.content?.parts?.[0]?.text || ''; } catch {}
-        }
-      }
+    for await (const d of readSseData(res)) {
+      try { yield JSON.parse(d).candidates?.[0]?.content?.parts?.[0]?.text || ''; } catch {}
     }
   }
 }
@@ -138,15 +138,25 @@ class OpenRouterProvider implements AiProvider {
   constructor(private apiKey: string) {}
 
   async chat(messages: { role: string; content: string }[], model: string): Promise<string> {
-    const res = await withTimeout(fetch('https://openrouter.ai/api/v1/chat/completions', {
+    const res = await fetchWithTimeout('https://openrouter.ai/api/v1/chat/completions', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${this.apiKey}` },
       body: JSON.stringify({ model: model || 'meta-llama/llama-3-8b-instruct', messages, max_tokens: 2048 }),
-    }), 25000);
+    }, 25000);
     if (!res.ok) throw new Error(`OpenRouter ${res.status}`);
     const data = await res.json() as any;
     return data.choices?.[0]?.message?.content || '';
   }
+
+  async *chatStream(messages: { role: string; content: string }[], model: string): AsyncGenerator<string> {
+    const res = await fetchWithTimeout('https://openrouter.ai/api/v1/chat/completions', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${this.apiKey}` },
+      body: JSON.stringify({ model: model || 'meta-llama/llama-3-8b-instruct', messages, stream: true, max_tokens: 2048 }),
+    }, 25000);
+    if (!res.ok) throw new Error(`OpenRouter stream ${res.status}`);
+    yield* readChatCompletionStream(res);
+  }
 }
 
 // Cloudflare Workers AI Provider — uses the AI binding, no API key needed
@@ -174,9 +184,30 @@ class WorkersAiProvider implements AiProvider {
   }
 }
 
+type ProviderChain = { name: string; model: string; provider: AiProvider }[];
+
+// Chains are reused across updates; keyed by preferred provider + configured keys
+const chainCache = new Map<string, ProviderChain>();
+
+function getProviderChain(env: Record<string, string | undefined>, preferred?: string): ProviderChain {
+  const key = [
+    preferred || '',
+    env.OPENAI_API_KEY || '',
+    env.GEMINI_API_KEY || '',
+    env.OPENROUTER_API_KEY || '',
+    (env as any).AI ? 'ai' : '',
+  ].join('|');
+  let chain = chainCache.get(key);
+  if (!chain) {
+    chain = buildProviderChain(env, preferred);
+    chainCache.set(key, chain);
+  }
+  return chain;
+}
+
 // Build provider chain based on available keys
-function buildProviderChain(env: Record<string, string | undefined>, preferred?: string): { name: string; model: string; provider: AiProvider }[] {
-  const chain: { name: string; model: string; provider: AiProvider }[] = [];
+function buildProviderChain(env: Record<string, string | undefined>, preferred?: string): ProviderChain {
+  const chain: ProviderChain = [];
   const added = new Set<string>();
 
   const add = (name: string, model: string, create: () => AiProvider) => {
@@ -186,6 +217,7 @@ function buildProviderChain(env: Record<string, string | undefined>, preferred?:
   // Preferred first
   if (preferred === 'openai' && env.OPENAI_API_KEY) add('openai', 'gpt-3.5-turbo', () => new OpenAiProvider(env.OPENAI_API_KEY!));
   if (preferred === 'gemini' && env.GEMINI_API_KEY) add('gemini', 'gemini-1.5-flash', () => new GeminiProvider(env.GEMINI_API_KEY!));
+  if (preferred === 'openrouter' && env.OPENROUTER_API_KEY) add('openrouter', 'meta-llama/llama-3-8b-instruct', () => new OpenRouterProvider(env.OPENROUTER_API_KEY!));
 
   // Fallbacks
   if (env.GEMINI_API_KEY) add('gemini', 'gemini-1.5-flash', () => new GeminiProvider(env.GEMINI_API_KEY!));
@@ -205,7 +237,7 @@ async function sendAiResponse(
   model: string,
   env: Record<string, string | undefined>
 ): Promise<string> {
-  const chain = buildProviderChain(env, providerName);
+  const chain = getProviderChain(env, providerName);
   if (chain.length === 0) throw new Error('No AI providers configured');
 
   // Try streaming first with preferred provider
@@ -251,12 +283,14 @@ async function sendAiResponse(
   throw new Error('All AI providers failed');
 }
 
-// Cache key for deduplicating identical questions
-function cacheKey(messages: { role: string; content: string }[]): string {
-  const lastUser = messages.filter(m => m.role === 'user').pop();
-  return `ai:${lastUser?.content?.substring(0, 100) || 'empty'}`;
+// Cache key for deduplicating identical questions (keyed on the new user message)
+function cacheKey(message: string): string {
+  return `ai:${message.substring(0, 100) || 'empty'}`;
 }
 
+const SYSTEM_PROMPT = 'You are Ikol, a helpful AI assistant in Telegram. Be concise and helpful. Respond in the same language the user writes in.';
+const MAX_HISTORY = 20;
+
 // Handle AI chat
 async function handleAiChat(ctx: any, message: string) {
   const db = ctx.db;
@@ -278,36 +312,35 @@ async function handleAiChat(ctx: any, message: string) {
     } catch {}
   }
 
-  // Get settings
+  // Get settings and history (independent reads, fetched concurrently)
   let providerName = 'gemini';
   let model = 'gemini-1.5-flash';
+  let history: any[] = [];
   if (db) {
+    const [user, rows] = await Promise.all([
+      ctx.dbUser !== undefined ? ctx.dbUser : db.getUser(userId).catch(() => null),
+      db.getConversationHistory(userId, MAX_HISTORY).catch(() => []),
+    ]);
     try {
-      const user = await db.getUser(userId);
       if (user?.settings) {
         const s = JSON.parse(user.settings);
         providerName = s.aiProvider || 'gemini';
         model = s.aiModel || (providerName === 'gemini' ? 'gemini-1.5-flash' : 'gpt-3.5-turbo');
       }
     } catch {}
-  }
-
-  // Get history
-  let history: any[] = [];
-  if (db) {
-    try { history = await db.getConversationHistory(userId, 20); } catch {}
+    history = rows;
   }
 
   const messages = [
-    { role: 'system', content: 'You are Ikol, a helpful AI assistant in Telegram. Be concise and helpful. Respond in the same language the user writes in.' },
+    { role: 'system', content: SYSTEM_PROMPT },
     ...history.map((h: any) => ({ role: h.role, content: h.content })),
     { role: 'user', content: message },
   ];
 
   // Check cache for repeated questions (short TTL)
+  const key = cacheKey(message);
   if (cache) {
     try {
-      const key = cacheKey(messages);
       const cached = await cache.get<string>(key);
       if (cached) {
         await ctx.reply(cached.length > 4000 ? cached.substring(0, 4000) + '...' : cached);
@@ -331,15 +364,13 @@ async function handleAiChat(ctx: any, message: string) {
 
     // Cache short responses
     if (cache && response && response.length < 500) {
-      try { await cache.set(cacheKey(messages), response, 'ai', 300); } catch {}
+      try { await cache.set(key, response, 'ai', 300); } catch {}
     }
 
-    // Save to history
+    // Save to history (single batched write)
     if (db) {
       try {
-        await db.addConversation(userId, 'user', message, providerName, model);
-        await db.addConversation(userId, 'assistant', response, providerName, model);
-        await db.trackApiUsage(userId, providerName, model, Math.ceil(response.length / 4));
+        await db.recordAiExchange(userId, message, response, providerName, model, Math.ceil(response.length / 4));
       } catch {}
     }
   } catch (error) {
@@ -388,7 +419,7 @@ function createAiModule(): IkolModule {
           let current = 'gemini';
           if (db && userId) {
             try {
-              const user = await db.getUser(userId);
+              const user = (ctx as any).dbUser !== undefined ? (ctx as any).dbUser : await db.getUser(userId);
               if (user?.settings) current = JSON.parse(user.settings).aiProvider || 'gemini';
             } catch {}
           }
@@ -446,15 +477,10 @@ function createAiModule(): IkolModule {
         }
 
         try {
-          const history = await db.getConversationHistory(userId, 5);
-          if (history.length > 0) {
-            await handleAiChat(ctx, text);
-            return;
-          }
-
+          // Cheap text checks first; only hit D1 when they don't decide it
           const botName = (ctx as any).botInfo?.first_name?.toLowerCase() || 'ikol';
           const addressed = text.toLowerCase().includes(botName);
-          if (addressed || text.length > 30) {
+          if (addressed || text.length > 30 || await db.hasConversation(userId)) {
             await handleAiChat(ctx, text);
             return;
           }
@@ -19,6 +19,9 @@ const searchSessions = new Map<string, {
   timestamp: number;
 }>();
 
+// chatId + query prefix (as carried in callback data) -> session key
+export const sessionsByHash = new Map<string, string>();
+
 const SESSION_TTL = 30 * 60 * 1000; // 30 minutes
 
 function getSessionKey(chatId: number, query: string): string {
@@ -36,7 +39,7 @@ function getCachedSession(chatId: number, query: string) {
   return session;
 }
 
-function setCachedSession(chatId: number, query: string, data: {
+export function setCachedSession(chatId: number, query: string, data: {
   results: MusicSearchResult[];
   source: string;
 }) {
@@ -47,15 +50,21 @@ function setCachedSession(chatId: number, query: string, data: {
     source: data.source,
     timestamp: Date.now(),
   });
+  sessionsByHash.set(`${chatId}:${query.slice(0, 30)}`, key);
 }
 
-function findSessionByHash(chatId: number, queryHash: string) {
-  for (const [key, session] of searchSessions.entries()) {
-    if (!key.startsWith(`${chatId}:`)) continue;
-    const hash = encodeURIComponent(session.query.slice(0, 30));
-    if (hash === queryHash) return session;
+// queryHash arrives already decoded from the callback data
+export function findSessionByHash(chatId: number, queryHash: string) {
+  const hashKey = `${chatId}:${queryHash}`;
+  const key = sessionsByHash.get(hashKey);
+  if (!key) return null;
+  const session = searchSessions.get(key);
+  if (!session || Date.now() - session.timestamp > SESSION_TTL) {
+    searchSessions.delete(key);
+    sessionsByHash.delete(hashKey);
+    return null;
   }
-  return null;
+  return session;
 }
 
 function formatDurationShort(seconds: number): string {
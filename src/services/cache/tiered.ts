@@ -3,6 +3,9 @@
 import { getCachePolicy, type CachePolicy } from './policies.js';
 import { metrics } from '../metrics/index.js';
 
+// Upper bound on L1 entries; the oldest insertion is evicted first
+const L1_MAX_ENTRIES = 1000;
+
 interface CacheEntry<T> {
   value: T;
   expires: number;
@@ -16,6 +19,15 @@ export class TieredCache {
     this.kv = kv;
   }
 
+  private setL1(key: string, value: unknown, ttlMs: number) {
+    this.l1.delete(key);
+    if (this.l1.size >= L1_MAX_ENTRIES) {
+      const oldest = this.l1.keys().next().value;
+      if (oldest !== undefined) this.l1.delete(oldest);
+    }
+    this.l1.set(key, { value, expires: Date.now() + ttlMs });
+  }
+
   async get<T>(key: string, feature?: string): Promise<T | null> {
     // L1 check
     const l1Entry = this.l1.get(key);
@@ -34,7 +46,7 @@ export class TieredCache {
       const value = await this.kv.get(key, 'json');
       if (value !== null) {
         const policy = getCachePolicy(feature || 'default');
-        this.l1.set(key, { value, expires: Date.now() + policy.l1TTL });
+        this.setL1(key, value, policy.l1TTL);
         metrics.recordCacheHit();
         return value as T;
       }
@@ -50,7 +62,7 @@ export class TieredCache {
     const l2TTL = ttlSeconds ?? policy.l2TTL;
 
     // Set L1
-    this.l1.set(key, { value, expires: Date.now() + l1TTL });
+    this.setL1(key, value, l1TTL);
 
     // Set L2 (KV)
     if (this.kv) {
@@ -79,8 +79,8 @@ export class CircuitBreaker {
       } else {
         await this.setState(name, { ...s, halfOpenAttempts: attempts });
       }
-    } else {
-      // Reset failure count on success
+    } else if (s.state !== 'closed' || s.failures > 0) {
+      // Reset failure count on success; an already clean circuit needs no write
       await this.setState(name, { state: 'closed', failures: 0, lastFailure: 0, halfOpenAttempts: 0 });
     }
   }
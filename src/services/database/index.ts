@@ -8,16 +8,39 @@ const ALLOWED_COLUMNS = new Set([
   'username', 'first_name', 'last_name', 'language', 'is_admin', 'settings',
 ]);
 
+// Users rows are read on every update; keep them briefly per isolate to absorb bursts.
+// Writes through this service invalidate the entry only in this isolate, so the TTL
+// is kept short: other isolates may serve a stale row (settings, language) for up to 5s.
+const USER_CACHE_TTL = 5_000;
+const USER_CACHE_MAX = 500;
+
 export class DatabaseService {
   private db: D1Database;
+  private userCache = new Map<number, { row: any; expires: number }>();
 
   constructor(db: D1Database) {
     this.db = db;
   }
 
+  // Like getUser, but lets D1 errors propagate so callers can tell "no such user" from a failed read
+  async findUser(userId: number) {
+    const cached = this.userCache.get(userId);
+    if (cached && cached.expires > Date.now()) return cached.row;
+    const row = await this.db.prepare('SELECT * FROM users WHERE id = ?').bind(userId).first() as any;
+    if (row) {
+      this.userCache.delete(userId);
+      if (this.userCache.size >= USER_CACHE_MAX) {
+        const oldest = this.userCache.keys().next().value;
+        if (oldest !== undefined) this.userCache.delete(oldest);
+      }
+      this.userCache.set(userId, { row, expires: Date.now() + USER_CACHE_TTL });
+    }
+    return row;
+  }
+
   async getUser(userId: number) {
     try {
-      return await this.db.prepare('SELECT * FROM users WHERE id = ?').bind(userId).first() as any;
+      return await this.findUser(userId);
     } catch (error) {
       logger.warn('getUser failed', { userId, error: (error as Error).message });
       return null;
@@ -26,6 +49,7 @@ export class DatabaseService {
 
   async createUser(userId: number, username?: string, firstName?: string, lastName?: string) {
     const now = new Date().toISOString();
+    this.userCache.delete(userId);
     try {
       await this.db.prepare(
         `INSERT OR IGNORE INTO users (id, username, first_name, last_name, language, created_at, last_active, settings)
@@ -41,6 +65,7 @@ export class DatabaseService {
     if (keys.length === 0) return;
     const values = keys.map(k => data[k]);
     const setClause = keys.map(k => `${k} = ?`).join(', ');
+    this.userCache.delete(userId);
     try {
       await this.db.prepare(`UPDATE users SET ${setClause} WHERE id = ?`).bind(...values, userId).run();
     } catch (error) {
@@ -56,29 +81,53 @@ export class DatabaseService {
     }
   }
 
+  // Most recent `limit` turns in chronological order; only the columns the prompt needs
   async getConversationHistory(userId: number, limit = 20) {
     try {
       const r = await this.db.prepare(
-        'SELECT * FROM conversations WHERE user_id = ? ORDER BY created_at ASC LIMIT ?'
+        'SELECT role, content FROM conversations WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT ?'
       ).bind(userId, limit).all();
-      return r.results as any[];
+      return (r.results as any[]).reverse();
     } catch (error) {
       logger.warn('getConversationHistory failed', { userId, error: (error as Error).message });
       return [];
     }
   }
 
+  // Shared INSERT builders, used by the single-row writers and recordAiExchange's batch
+  private conversationInsert(userId: number, role: string, content: string, provider: string | null, model: string | null, createdAt: string) {
+    return this.db.prepare(
+      `INSERT INTO conversations (user_id, role, content, provider, model, created_at)
+       VALUES (?, ?, ?, ?, ?, ?)`
+    ).bind(userId, role, content, provider, model, createdAt);
+  }
+
+  private apiUsageInsert(userId: number, provider: string, model: string, tokens: number, createdAt: string) {
+    return this.db.prepare(
+      `INSERT INTO api_usage (user_id, provider, model, tokens, created_at)
+       VALUES (?, ?, ?, ?, ?)`
+    ).bind(userId, provider, model, tokens, createdAt);
+  }
+
   async addConversation(userId: number, role: string, content: string, provider?: string, model?: string) {
     try {
-      await this.db.prepare(
-        `INSERT INTO conversations (user_id, role, content, provider, model, created_at)
-         VALUES (?, ?, ?, ?, ?, ?)`
-      ).bind(userId, role, content, provider || null, model || null, new Date().toISOString()).run();
+      await this.conversationInsert(userId, role, content, provider || null, model || null, new Date().toISOString()).run();
     } catch (error) {
       logger.warn('addConversation failed', { userId, error: (error as Error).message });
     }
   }
 
+  // Existence check only; stops at the first matching row
+  async hasConversation(userId: number): Promise<boolean> {
+    try {
+      const row = await this.db.prepare('SELECT 1 FROM conversations WHERE user_id = ? LIMIT 1').bind(userId).first();
+      return row !== null;
+    } catch (error) {
+      logger.warn('hasConversation failed', { userId, error: (error as Error).message });
+      return false;
+    }
+  }
+
   async clearConversation(userId: number) {
     try {
       await this.db.prepare('DELETE FROM conversations WHERE user_id = ?').bind(userId).run();
@@ -100,15 +149,33 @@ export class DatabaseService {
 
   async trackApiUsage(userId: number, provider: string, model: string, tokens: number) {
     try {
-      await this.db.prepare(
-        `INSERT INTO api_usage (user_id, provider, model, tokens, created_at)
-         VALUES (?, ?, ?, ?, ?)`
-      ).bind(userId, provider, model, tokens, new Date().toISOString()).run();
+      await this.apiUsageInsert(userId, provider, model, tokens, new Date().toISOString()).run();
     } catch (error) {
       logger.warn('trackApiUsage failed', { userId, error: (error as Error).message });
     }
   }
 
+  // Persist a full AI exchange (user turn, assistant turn, usage) in one D1 round-trip
+  async recordAiExchange(
+    userId: number,
+    message: string,
+    response: string,
+    provider: string,
+    model: string,
+    tokens: number
+  ) {
+    const now = new Date().toISOString();
+    try {
+      await this.db.batch([
+        this.conversationInsert(userId, 'user', message, provider, model, now),
+        this.conversationInsert(userId, 'assistant', response, provider, model, now),
+        this.apiUsageInsert(userId, provider, model, tokens, now),
+      ]);
+    } catch (error) {
+      logger.warn('recordAiExchange failed', { userId, error: (error as Error).message });
+    }
+  }
+
   async getStats() {
     try {
       const [users, messages, downloads] = await this.db.batch([
@@ -214,19 +214,8 @@ export class PinterestProvider implements ImageProvider {
     return upgraded;
   }
 
+  // Only config is checked here; a blocked or unreachable site fails search()
   async isAvailable(): Promise<boolean> {
-    if (this.config.provider === 'api' && !this.config.accessToken) {
-      return false;
-    }
-
-    try {
-      const response = await fetch('https://www.pinterest.com', {
-        method: 'HEAD',
-        signal: AbortSignal.timeout(5000),
-      });
-      return response.ok || response.status === 403;
-    } catch {
-      return false;
-    }
+    return !(this.config.provider === 'api' && !this.config.accessToken);
   }
 }
@@ -27,6 +27,9 @@ const BLOCKED_PATTERNS = [
   /data:text\/html/i,
 ];
 
+const WWW_PREFIX = /^www\./;
+const ANGLE_BRACKETS = /[<>]/g;
+
 const MAX_FILE_SIZE = 10 * 1024 * 1024; // 10MB
 const SAFE_SEARCH_KEYWORDS = [
   'nsfw',
@@ -50,7 +53,7 @@ export function validateImageUrl(url: string): SecurityCheckResult {
 
   try {
     const parsed = new URL(url);
-    const domain = parsed.hostname.replace(/^www\./, '');
+    const domain = parsed.hostname.replace(WWW_PREFIX, '');
 
     const isAllowed = ALLOWED_DOMAINS.some((d) =>
       domain === d || domain.endsWith(`.${d}`)
@@ -133,8 +136,8 @@ export function sanitizeResults(results: ImageSearchResult[]): ImageSearchResult
   return results
     .map((r) => ({
       ...r,
-      title: r.title.replace(/[<>]/g, ''),
-      description: r.description?.replace(/[<>]/g, ''),
+      title: r.title.replace(ANGLE_BRACKETS, ''),
+      description: r.description?.replace(ANGLE_BRACKETS, ''),
     }))
     .filter((r) => {
       const urlCheck = validateImageUrl(r.imageUrl);
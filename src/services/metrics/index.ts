@@ -50,6 +50,33 @@ export interface MetricSnapshot {
 const MAX_LATENCY_ENTRIES = 100;
 const RECENT_ERRORS_MAX = 50;
 
+// Fixed-capacity ring buffer: O(1) push instead of Array#shift on a full window
+class RingBuffer<T> {
+  private items: T[] = [];
+  private next = 0;
+
+  constructor(private capacity: number) {}
+
+  get length(): number {
+    return this.items.length;
+  }
+
+  push(item: T) {
+    if (this.items.length < this.capacity) {
+      this.items.push(item);
+    } else {
+      this.items[this.next] = item;
+    }
+    this.next = (this.next + 1) % this.capacity;
+  }
+
+  // Oldest-first copy
+  toArray(): T[] {
+    if (this.items.length < this.capacity) return this.items.slice();
+    return this.items.slice(this.next).concat(this.items.slice(0, this.next));
+  }
+}
+
 class MetricsCollector {
   private startTime = Date.now();
   private requestCount = 0;
@@ -69,25 +96,23 @@ class MetricsCollector {
   private cacheHits = 0;
   private cacheMisses = 0;
   private latencyBuckets = {
-    webhook: [] as number[],
-    ai: [] as number[],
-    download: [] as number[],
-    music: [] as number[],
-    database: [] as number[],
-    kv: [] as number[],
+    webhook: new RingBuffer<number>(MAX_LATENCY_ENTRIES),
+    ai: new RingBuffer<number>(MAX_LATENCY_ENTRIES),
+    download: new RingBuffer<number>(MAX_LATENCY_ENTRIES),
+    music: new RingBuffer<number>(MAX_LATENCY_ENTRIES),
+    database: new RingBuffer<number>(MAX_LATENCY_ENTRIES),
+    kv: new RingBuffer<number>(MAX_LATENCY_ENTRIES),
   };
   private errorCount = 0;
   private errorsByModule = new Map<string, number>();
-  private recentErrors: Array<{ ts: string; module: string; message: string }> = [];
+  private recentErrors = new RingBuffer<{ ts: string; module: string; message: string }>(RECENT_ERRORS_MAX);
 
   private getStartOfDay(): string {
     return new Date().toISOString().split('T')[0];
   }
 
   private pushLatency(bucket: keyof typeof this.latencyBuckets, ms: number) {
-    const arr = this.latencyBuckets[bucket];
-    arr.push(ms);
-    if (arr.length > MAX_LATENCY_ENTRIES) arr.shift();
+    this.latencyBuckets[bucket].push(ms);
   }
 
   private p95(arr: number[]): number {
@@ -143,7 +168,6 @@ class MetricsCollector {
     this.errorCount++;
     this.errorsByModule.set(module, (this.errorsByModule.get(module) || 0) + 1);
     this.recentErrors.push({ ts: new Date().toISOString(), module, message });
-    if (this.recentErrors.length > RECENT_ERRORS_MAX) this.recentErrors.shift();
   }
 
   // Remove user from active set after inactivity (call periodically)
@@ -185,17 +209,17 @@ class MetricsCollector {
         hitRatio: totalCache > 0 ? this.cacheHits / totalCache : 0,
       },
       latency: {
-        webhook: [...this.latencyBuckets.webhook],
-        ai: [...this.latencyBuckets.ai],
-        download: [...this.latencyBuckets.download],
-        music: [...this.latencyBuckets.music],
-        database: [...this.latencyBuckets.database],
-        kv: [...this.latencyBuckets.kv],
+        webhook: this.latencyBuckets.webhook.toArray(),
+        ai: this.latencyBuckets.ai.toArray(),
+        download: this.latencyBuckets.download.toArray(),
+        music: this.latencyBuckets.music.toArray(),
+        database: this.latencyBuckets.database.toArray(),
+        kv: this.latencyBuckets.kv.toArray(),
       },
       errors: {
         total: this.errorCount,
         byModule: Object.fromEntries(this.errorsByModule),
-        recent: [...this.recentErrors],
+        recent: this.recentErrors.toArray(),
       },
     };
   }
@@ -63,19 +63,6 @@ class CobaltProvider {
       platform: platform?.platform || 'unknown',
     };
   }
-
-  async isAvailable(): Promise<boolean> {
-    try {
-      // Cobalt API is POST-only; just check if the endpoint is reachable
-      const response = await fetch(this.apiUrl, {
-        method: 'HEAD',
-      });
-      // 405 means the server is up but doesn't accept HEAD - that's fine
-      return response.ok || response.status === 405;
-    } catch {
-      return false;
-    }
-  }
 }
 
 // Direct Extraction Provider (Fallback for specific platforms)
@@ -171,8 +158,16 @@ class DirectExtractionProvider {
 }
 
 // Create downloader provider chain
+let _chain: MultiProvider<DownloadResult> | null = null;
+let _chainEnv: string | undefined;
+
 export function createDownloaderProviderChain(env?: Record<string, string | undefined>): MultiProvider<DownloadResult> {
+  const envKey = [env?.COBALT_API_URL, env?.COBALT_API_KEY].join('|');
+  if (_chain && _chainEnv === envKey) return _chain;
+
   const provider = new MultiProvider<DownloadResult>(null);
+  _chain = provider;
+  _chainEnv = envKey;
   const cobalt = new CobaltProvider({ COBALT_API_URL: env?.COBALT_API_URL, COBALT_API_KEY: env?.COBALT_API_KEY });
   const direct = new DirectExtractionProvider();
 
@@ -180,7 +175,6 @@ export function createDownloaderProviderChain(env?: Record<string, string | unde
     name: 'cobalt',
     priority: 1,
     execute: (url: string, options?: any) => cobalt.execute(url, options),
-    isAvailable: () => cobalt.isAvailable(),
   });
 
   provider.addProvider({
@@ -27,15 +27,6 @@ class FrankfurterProvider {
       source: 'frankfurter',
     }));
   }
-
-  async isAvailable(): Promise<boolean> {
-    try {
-      const response = await fetch('https://api.frankfurter.app/latest?from=USD&to=EUR');
-      return response.ok;
-    } catch {
-      return false;
-    }
-  }
 }
 
 // ExchangeRate-API Provider (fallback, requires API key)
@@ -53,9 +44,8 @@ class ExchangeRateProvider {
       throw new Error('ExchangeRate API key not configured');
     }
 
-    // ExchangeRate-API v6 supports only one pair at a time
-    const results: CurrencyRate[] = [];
-    for (const target of targets) {
+    // ExchangeRate-API v6 supports only one pair at a time; fetch the pairs concurrently
+    return Promise.all(targets.map(async (target): Promise<CurrencyRate> => {
       const response = await fetch(
         `https://v6.exchangerate-api.com/v6/${this.apiKey}/pair/${base}/${target}`
       );
@@ -65,15 +55,14 @@ class ExchangeRateProvider {
       }
 
       const data = await response.json() as any;
-      results.push({
+      return {
         from: base,
         to: target,
         rate: data.conversion_rate,
         timestamp: Date.now(),
         source: 'exchangerate-api',
-      });
-    }
-    return results;
+      };
+    }));
   }
 
   async isAvailable(): Promise<boolean> {
@@ -104,15 +93,6 @@ class MetalsProvider {
       metal: metal.metal,
     }));
   }
-
-  async isAvailable(): Promise<boolean> {
-    try {
-      const response = await fetch('https://api.metals.live/v1/spot');
-      return response.ok;
-    } catch {
-      return false;
-    }
-  }
 }
 
 // CoinGecko Provider (Crypto)
@@ -146,15 +126,6 @@ class CoinGeckoProvider {
       source: 'coingecko',
     };
   }
-
-  async isAvailable(): Promise<boolean> {
-    try {
-      const response = await fetch('https://api.coingecko.com/api/v3/ping');
-      return response.ok;
-    } catch {
-      return false;
-    }
-  }
 }
 
 // CoinCap Provider (Fallback crypto)
@@ -182,20 +153,23 @@ class CoinCapProvider {
       source: 'coincap',
     };
   }
-
-  async isAvailable(): Promise<boolean> {
-    try {
-      const response = await fetch('https://api.coincap.io/v2/assets/bitcoin');
-      return response.ok;
-    } catch {
-      return false;
-    }
-  }
 }
 
-// Provider Chains
+// Provider Chains (singletons, so per-provider metrics persist across requests)
+// Keyless providers register without isAvailable: MultiProvider treats them as available
+// and real failures fall through to the next provider.
+let _currency: MultiProvider<CurrencyRate[]> | null = null;
+let _currencyEnv: string | undefined;
+let _gold: MultiProvider<GoldPrice[]> | null = null;
+let _crypto: MultiProvider<CryptoPrice> | null = null;
+
 export function createCurrencyProvider(env?: Record<string, string | undefined>): MultiProvider<CurrencyRate[]> {
+  const envKey = env?.EXCHANGERATE_API_KEY || '';
+  if (_currency && _currencyEnv === envKey) return _currency;
+
   const provider = new MultiProvider<CurrencyRate[]>(null);
+  _currency = provider;
+  _currencyEnv = envKey;
   const frankfurter = new FrankfurterProvider();
   const exchangerate = new ExchangeRateProvider(env?.EXCHANGERATE_API_KEY);
 
@@ -203,7 +177,6 @@ export function createCurrencyProvider(env?: Record<string, string | undefined>)
     name: 'frankfurter',
     priority: 1,
     execute: (base: string, targets: string[]) => frankfurter.execute(base, targets),
-    isAvailable: () => frankfurter.isAvailable(),
   });
 
   provider.addProvider({
@@ -217,21 +190,26 @@ export function createCurrencyProvider(env?: Record<string, string | undefined>)
 }
 
 export function createGoldProvider(): MultiProvider<GoldPrice[]> {
+  if (_gold) return _gold;
+
   const provider = new MultiProvider<GoldPrice[]>(null);
+  _gold = provider;
   const metals = new MetalsProvider();
 
   provider.addProvider({
     name: 'metals-live',
     priority: 1,
     execute: () => metals.execute(),
-    isAvailable: () => metals.isAvailable(),
   });
 
   return provider;
 }
 
 export function createCryptoProvider(): MultiProvider<CryptoPrice> {
+  if (_crypto) return _crypto;
+
   const provider = new MultiProvider<CryptoPrice>(null);
+  _crypto = provider;
   const coingecko = new CoinGeckoProvider();
   const coincap = new CoinCapProvider();
 
@@ -239,14 +217,12 @@ export function createCryptoProvider(): MultiProvider<CryptoPrice> {
     name: 'coingecko',
     priority: 1,
     execute: (coinId: string) => coingecko.execute(coinId),
-    isAvailable: () => coingecko.isAvailable(),
   });
 
   provider.addProvider({
     name: 'coincap',
     priority: 2,
     execute: (coinId: string) => coincap.execute(coinId),
-    isAvailable: () => coincap.isAvailable(),
   });
 
   return provider;
@@ -29,15 +29,39 @@ class LRCLIBProvider {
       source: 'lrclib',
     };
   }
+}
 
-  async isAvailable(): Promise<boolean> {
-    try {
-      const response = await fetch('https://lrclib.net/api/health');
-      return response.ok;
-    } catch {
-      return false;
+const LYRICS_CONTAINER_ATTR = 'data-lyrics-container="true"';
+const BR_TAG = /<br\s*\/?>/gi;
+const HTML_TAG = /<[^>]+>/g;
+
+// Single pass over the page: for each lyrics container, track <div> depth so
+// nested divs don't end the match early. Genius splits a song across several
+// containers, so all of them are returned in document order.
+export function extractLyricsContainers(html: string): string[] {
+  const parts: string[] = [];
+  let pos = html.indexOf(LYRICS_CONTAINER_ATTR);
+
+  while (pos !== -1) {
+    const start = html.indexOf('>', pos) + 1;
+    if (start === 0) break;
+
+    let depth = 1;
+    let cursor = start;
+    while (depth > 0) {
+      const next = html.indexOf('<', cursor);
+      if (next === -1) break;
+      if (html.startsWith('</div', next)) depth--;
+      else if (html.startsWith('<div', next)) depth++;
+      cursor = next + 1;
     }
+    if (depth > 0) break;
+
+    parts.push(html.slice(start, cursor - 1));
+    pos = html.indexOf(LYRICS_CONTAINER_ATTR, cursor);
   }
+
+  return parts;
 }
 
 // Genius Provider (Free for non-commercial)
@@ -87,16 +111,16 @@ class GeniusProvider {
     const html = await lyricsResponse.text();
 
     // Extract lyrics from HTML
-    const lyricsMatch = html.match(/<div[^>]*data-lyrics-container="true"[^>]*>([\s\S]*?)<\/div>/);
+    const containers = extractLyricsContainers(html);
 
-    if (!lyricsMatch) {
+    if (containers.length === 0) {
       throw new Error('Could not extract lyrics from Genius');
     }
 
     // Clean HTML tags
-    const plainLyrics = lyricsMatch[1]
-      .replace(/<br\s*\/?>/gi, '\n')
-      .replace(/<[^>]+>/g, '')
+    const plainLyrics = containers.join('\n')
+      .replace(BR_TAG, '\n')
+      .replace(HTML_TAG, '')
       .trim();
 
     return {
@@ -170,9 +194,17 @@ class MusixmatchProvider {
   }
 }
 
-// Create lyrics provider chain
+// Create lyrics provider chain (singleton per credentials, so per-provider metrics persist)
+let _chain: MultiProvider<LyricsResult> | null = null;
+let _chainEnv: string | undefined;
+
 export function createLyricsProviderChain(env?: Record<string, string | undefined>): MultiProvider<LyricsResult> {
+  const envKey = [env?.GENIUS_API_KEY, env?.MUSIXMATCH_API_KEY].join('|');
+  if (_chain && _chainEnv === envKey) return _chain;
+
   const provider = new MultiProvider<LyricsResult>(null);
+  _chain = provider;
+  _chainEnv = envKey;
   const lrclib = new LRCLIBProvider();
   const genius = new GeniusProvider(env?.GENIUS_API_KEY);
   const musixmatch = new MusixmatchProvider(env?.MUSIXMATCH_API_KEY);
@@ -181,7 +213,6 @@ export function createLyricsProviderChain(env?: Record<string, string | undefine
     name: 'lrclib',
     priority: 1,
     execute: (artist: string, title: string) => lrclib.execute(artist, title),
-    isAvailable: () => lrclib.isAvailable(),
   });
 
   provider.addProvider({
@@ -183,7 +183,8 @@ let _chainEnv: string | undefined;
 let _lastfm: LastFmProvider | null = null;
 
 export function createMusicProviderChain(env?: Record<string, string | undefined>): MultiProvider<MusicSearchResult[]> {
-  const envKey = JSON.stringify(env || {});
+  // Key on the credentials the chain uses instead of serialising the whole env per search
+  const envKey = [env?.SPOTIFY_CLIENT_ID, env?.SPOTIFY_CLIENT_SECRET, env?.LASTFM_API_KEY].join('|');
   if (_chain && _chainEnv === envKey) return _chain;
 
   _chain = new MultiProvider<MusicSearchResult[]>(null);
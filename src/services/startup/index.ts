@@ -16,10 +16,18 @@ export interface StartupCheck {
 
 let startupDone = false;
 let startupReport: StartupCheck[] = [];
+// In-flight verification, shared by concurrent requests on a cold isolate
+let startupPending: Promise<StartupCheck[]> | null = null;
 
 export async function runStartupVerification(env: Env): Promise<StartupCheck[]> {
   if (startupDone) return startupReport;
+  if (!startupPending) {
+    startupPending = verify(env).finally(() => { startupPending = null; });
+  }
+  return startupPending;
+}
 
+async function verify(env: Env): Promise<StartupCheck[]> {
   const checks: StartupCheck[] = [];
 
   // 1. Environment variables
@@ -44,29 +52,9 @@ export async function runStartupVerification(env: Env): Promise<StartupCheck[]>
   const modules = getRegisteredModules();
   checks.push(check('Modules', modules.length > 0 ? 'ok' : 'warn', `${modules.length} loaded: ${modules.map(m => m.name).join(', ')}`));
 
-  // 5. Database
-  try {
-    if (env.DB) {
-      await env.DB.prepare('SELECT 1 as ok').first();
-      checks.push(check('Database', 'ok', 'D1 connected'));
-    } else {
-      checks.push(check('Database', 'error', 'D1 not bound'));
-    }
-  } catch (e) {
-    checks.push(check('Database', 'error', `D1 error: ${(e as Error).message}`));
-  }
-
-  // 6. KV
-  try {
-    if (env.KV) {
-      await env.KV.put('_health', 'ok', { expirationTtl: 60 });
-      checks.push(check('KV', 'ok', 'KV connected'));
-    } else {
-      checks.push(check('KV', 'error', 'KV not bound'));
-    }
-  } catch (e) {
-    checks.push(check('KV', 'error', `KV error: ${(e as Error).message}`));
-  }
+  // 5-6. Database and KV (probed concurrently)
+  const [dbCheck, kvCheck] = await Promise.all([checkDatabase(env), checkKv(env)]);
+  checks.push(dbCheck, kvCheck);
 
   // 7. Optional providers
   const optionalServices = [
@@ -101,6 +89,26 @@ export async function runStartupVerification(env: Env): Promise<StartupCheck[]>
   return checks;
 }
 
+async function checkDatabase(env: Env): Promise<StartupCheck> {
+  try {
+    if (!env.DB) return check('Database', 'error', 'D1 not bound');
+    await env.DB.prepare('SELECT 1 as ok').first();
+    return check('Database', 'ok', 'D1 connected');
+  } catch (e) {
+    return check('Database', 'error', `D1 error: ${(e as Error).message}`);
+  }
+}
+
+async function checkKv(env: Env): Promise<StartupCheck> {
+  try {
+    if (!env.KV) return check('KV', 'error', 'KV not bound');
+    await env.KV.put('_health', 'ok', { expirationTtl: 60 });
+    return check('KV', 'ok', 'KV connected');
+  } catch (e) {
+    return check('KV', 'error', `KV error: ${(e as Error).message}`);
+  }
+}
+
 function check(name: string, status: 'ok' | 'warn' | 'error', message: string): StartupCheck {
   return { name, status, message };
 }
@@ -40,6 +40,25 @@ const PLATFORM_PATTERNS: Record<string, RegExp[]> = {
   ],
 };
 
+// Flattened once so detectPlatform walks a plain array instead of Object.entries per call
+const PLATFORM_PATTERN_LIST: Array<[string, RegExp]> = Object.entries(PLATFORM_PATTERNS)
+  .flatMap(([platform, patterns]) => patterns.map((pattern): [string, RegExp] => [platform, pattern]));
+
+const URL_PATTERN = /https?:\/\/[^\s]+/g;
+const MARKDOWN_SPECIAL_CHARS = /[_*[\]()~`>#+\-=|{}.!]/g;
+
+const PLATFORM_NAMES: Record<string, string> = {
+  youtube: 'YouTube',
+  instagram: 'Instagram',
+  tiktok: 'TikTok',
+  twitter: 'Twitter/X',
+  reddit: 'Reddit',
+  facebook: 'Facebook',
+  soundcloud: 'SoundCloud',
+  pinterest: 'Pinterest',
+  vimeo: 'Vimeo',
+};
+
 export interface PlatformInfo {
   platform: string;
   videoId?: string;
@@ -48,16 +67,14 @@ export interface PlatformInfo {
 
 // Detect platform from URL
 export function detectPlatform(url: string): PlatformInfo | null {
-  for (const [platform, patterns] of Object.entries(PLATFORM_PATTERNS)) {
-    for (const pattern of patterns) {
-      const match = url.match(pattern);
-      if (match) {
-        return {
-          platform,
-          videoId: match[1],
-          url,
-        };
-      }
+  for (const [platform, pattern] of PLATFORM_PATTERN_LIST) {
+    const match = pattern.exec(url);
+    if (match) {
+      return {
+        platform,
+        videoId: match[1],
+        url,
+      };
     }
   }
   return null;
@@ -75,8 +92,7 @@ export function isValidUrl(url: string): boolean {
 
 // Extract URLs from text
 export function extractUrls(text: string): string[] {
-  const urlPattern = /https?:\/\/[^\s]+/g;
-  return text.match(urlPattern) || [];
+  return text.match(URL_PATTERN) || [];
 }
 
 // Format file size
@@ -113,21 +129,55 @@ export function truncate(text: string, maxLength: number): string {
 
 // Escape markdown special characters
 export function escapeMarkdown(text: string): string {
-  return text.replace(/[_*[\]()~`>#+\-=|{}.!]/g, '\\$&');
+  return text.replace(MARKDOWN_SPECIAL_CHARS, '\\$&');
+}
+
+// Owner IDs parsed from the comma-separated OWNER_IDS env value.
+// Memoized on the raw string so the split/parse only reruns when it changes.
+let ownerIdsRaw: string | undefined;
+let ownerIds = new Set<number>();
+
+export function parseOwnerIds(raw?: string): Set<number> {
+  if (raw !== ownerIdsRaw) {
+    ownerIds = new Set(
+      (raw || '').split(',').map(id => parseInt(id.trim(), 10)).filter(id => !isNaN(id))
+    );
+    ownerIdsRaw = raw;
+  }
+  return ownerIds;
+}
+
+export function isOwnerId(userId: number | undefined, raw?: string): boolean {
+  return userId !== undefined && parseOwnerIds(raw).has(userId);
+}
+
+// Read the body into one preallocated buffer, giving up once it exceeds `max` bytes.
+// Covers requests without a (truthful) Content-Length; returns null when too large.
+export async function readBodyCapped(request: Request, max: number): Promise<string | null> {
+  const reader = request.body?.getReader();
+  if (!reader) return '';
+  const declared = Number(request.headers.get('content-length') || 0);
+  let buf = new Uint8Array(declared > 0 && declared <= max ? declared : 16 * 1024);
+  let size = 0;
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    if (size + value.byteLength > max) {
+      await reader.cancel();
+      return null;
+    }
+    if (size + value.byteLength > buf.byteLength) {
+      const grown = new Uint8Array(Math.min(max, Math.max(buf.byteLength * 2, size + value.byteLength)));
+      grown.set(buf.subarray(0, size));
+      buf = grown;
+    }
+    buf.set(value, size);
+    size += value.byteLength;
+  }
+  return new TextDecoder().decode(buf.subarray(0, size));
 }
 
 // Get platform display name
 export function getPlatformName(platform: string): string {
-  const names: Record<string, string> = {
-    youtube: 'YouTube',
-    instagram: 'Instagram',
-    tiktok: 'TikTok',
-    twitter: 'Twitter/X',
-    reddit: 'Reddit',
-    facebook: 'Facebook',
-    soundcloud: 'SoundCloud',
-    pinterest: 'Pinterest',
-    vimeo: 'Vimeo',
-  };
-  return names[platform] || platform;
+  return PLATFORM_NAMES[platform] || platform;
 }
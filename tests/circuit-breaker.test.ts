@@ -95,4 +95,14 @@ describe('CircuitBreaker', () => {
     await cb.recordFailure('test');
     expect(await cb.getStateLabel('test')).toBe('open');
   });
+
+  it('should not write state on success when already closed and clean', async () => {
+    await cb.recordSuccess('test');
+    expect(mockKV.put).not.toHaveBeenCalled();
+
+    await cb.recordFailure('test');
+    mockKV.put.mockClear();
+    await cb.recordSuccess('test');
+    expect(mockKV.put).toHaveBeenCalledTimes(1);
+  });
 });
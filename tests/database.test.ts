@@ -0,0 +1,54 @@
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+import { DatabaseService } from '../src/services/database/index.js';
+
+describe('DatabaseService user cache', () => {
+  let db: DatabaseService;
+  let first: any;
+  let mockD1: any;
+
+  beforeEach(() => {
+    vi.useFakeTimers();
+    first = vi.fn().mockResolvedValue({ id: 1, settings: '{"aiProvider":"gemini"}' });
+    const statement = {
+      bind: vi.fn().mockReturnThis(),
+      first,
+      run: vi.fn().mockResolvedValue({}),
+    };
+    mockD1 = { prepare: vi.fn().mockReturnValue(statement) };
+    db = new DatabaseService(mockD1);
+  });
+
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it('should serve repeated reads from cache', async () => {
+    await db.getUser(1);
+    const user = await db.getUser(1);
+    expect(user.settings).toBe('{"aiProvider":"gemini"}');
+    expect(first).toHaveBeenCalledTimes(1);
+  });
+
+  it('should re-read after the TTL expires', async () => {
+    await db.getUser(1);
+    vi.advanceTimersByTime(5_001);
+    await db.getUser(1);
+    expect(first).toHaveBeenCalledTimes(2);
+  });
+
+  it('should invalidate on updateUser', async () => {
+    await db.getUser(1);
+    await db.updateUser(1, { settings: '{"aiProvider":"openai"}' });
+    first.mockResolvedValue({ id: 1, settings: '{"aiProvider":"openai"}' });
+    const user = await db.getUser(1);
+    expect(user.settings).toBe('{"aiProvider":"openai"}');
+    expect(first).toHaveBeenCalledTimes(2);
+  });
+
+  it('should not cache missing users', async () => {
+    first.mockResolvedValue(null);
+    await db.getUser(2);
+    await db.getUser(2);
+    expect(first).toHaveBeenCalledTimes(2);
+  });
+});
@@ -0,0 +1,19 @@
+import { describe, it, expect } from 'vitest';
+import { extractLyricsContainers } from '../src/services/providers/lyrics.js';
+
+describe('extractLyricsContainers', () => {
+  it('should keep nested divs inside a container', () => {
+    const html = '<div data-lyrics-container="true">Line 1<br/><div><i>ad</i></div>Line 2</div>';
+    expect(extractLyricsContainers(html)).toEqual(['Line 1<br/><div><i>ad</i></div>Line 2']);
+  });
+
+  it('should return every container in order', () => {
+    const html = '<div class="x" data-lyrics-container="true">Verse 1</div><p>-</p><div data-lyrics-container="true">Verse 2</div>';
+    expect(extractLyricsContainers(html)).toEqual(['Verse 1', 'Verse 2']);
+  });
+
+  it('should ignore unterminated containers', () => {
+    expect(extractLyricsContainers('<div data-lyrics-container="true">open')).toEqual([]);
+    expect(extractLyricsContainers('<p>no lyrics</p>')).toEqual([]);
+  });
+});
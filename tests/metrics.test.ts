@@ -0,0 +1,28 @@
+import { describe, it, expect } from 'vitest';
+import { metrics } from '../src/services/metrics/index.js';
+
+describe('MetricsCollector windows', () => {
+  it('should keep the last 100 latencies oldest-first after wrap-around', () => {
+    for (let i = 0; i < 250; i++) metrics.recordLatency('kv', i);
+
+    const kv = metrics.getSnapshot().latency.kv;
+    expect(kv).toHaveLength(100);
+    expect(kv[0]).toBe(150);
+    expect(kv[99]).toBe(249);
+    expect(kv).toEqual(Array.from({ length: 100 }, (_, i) => 150 + i));
+  });
+
+  it('should keep the last 50 errors oldest-first after wrap-around', () => {
+    for (let i = 0; i < 73; i++) metrics.recordError('test', `error ${i}`);
+
+    const recent = metrics.getSnapshot().errors.recent;
+    expect(recent).toHaveLength(50);
+    expect(recent.map(e => e.message)).toEqual(Array.from({ length: 50 }, (_, i) => `error ${23 + i}`));
+  });
+
+  it('should return an unwrapped window as-is', () => {
+    metrics.recordLatency('music', 5);
+    metrics.recordLatency('music', 7);
+    expect(metrics.getSnapshot().latency.music).toEqual([5, 7]);
+  });
+});
@@ -0,0 +1,31 @@
+import { describe, it, expect, afterEach, vi } from 'vitest';
+import { setCachedSession, findSessionByHash, sessionsByHash } from '../src/modules/music/enhanced.js';
+
+// Mirrors the callback round-trip: the keyboard encodes the query prefix, the handler decodes it
+const callbackHash = (query: string) => decodeURIComponent(encodeURIComponent(query.slice(0, 30)));
+
+describe('music search sessions', () => {
+  afterEach(() => {
+    vi.useRealTimers();
+  });
+
+  it('should find sessions for queries with spaces and non-ASCII text', () => {
+    setCachedSession(1, 'bohemian rhapsody queen', { results: [], source: 'deezer' });
+    setCachedSession(1, 'محسن چاوشی من خود آن سیزدهم', { results: [], source: 'itunes' });
+
+    expect(findSessionByHash(1, callbackHash('bohemian rhapsody queen'))?.source).toBe('deezer');
+    expect(findSessionByHash(1, callbackHash('محسن چاوشی من خود آن سیزدهم'))?.source).toBe('itunes');
+    expect(findSessionByHash(2, callbackHash('bohemian rhapsody queen'))).toBeNull();
+  });
+
+  it('should expire sessions and drop their hash index entry', () => {
+    vi.useFakeTimers();
+    vi.setSystemTime(new Date('2026-01-01T00:00:00Z'));
+    setCachedSession(3, 'old song', { results: [], source: 'deezer' });
+    expect(sessionsByHash.has('3:old song')).toBe(true);
+
+    vi.setSystemTime(new Date('2026-01-01T00:31:00Z'));
+    expect(findSessionByHash(3, callbackHash('old song'))).toBeNull();
+    expect(sessionsByHash.has('3:old song')).toBe(false);
+  });
+});
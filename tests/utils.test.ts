@@ -1,5 +1,5 @@
 import { describe, it, expect } from 'vitest';
-import { detectPlatform, isValidUrl, extractUrls, formatFileSize, formatDuration } from '../src/utils/helpers.js';
+import { detectPlatform, isValidUrl, extractUrls, formatFileSize, formatDuration, parseOwnerIds, isOwnerId, readBodyCapped } from '../src/utils/helpers.js';
 
 describe('URL Utilities', () => {
   describe('detectPlatform', () => {
@@ -76,3 +76,55 @@ describe('Formatting Utilities', () => {
     });
   });
 });
+
+describe('Owner IDs', () => {
+  it('should parse comma-separated IDs and skip invalid entries', () => {
+    expect([...parseOwnerIds(' 1, 2,abc,3 ')]).toEqual([1, 2, 3]);
+    expect(parseOwnerIds(undefined).size).toBe(0);
+  });
+
+  it('should reuse the parsed set until the raw value changes', () => {
+    const first = parseOwnerIds('10,20');
+    expect(parseOwnerIds('10,20')).toBe(first);
+    expect(parseOwnerIds('30')).not.toBe(first);
+  });
+
+  it('should check owner membership', () => {
+    expect(isOwnerId(10, '10,20')).toBe(true);
+    expect(isOwnerId(11, '10,20')).toBe(false);
+    expect(isOwnerId(undefined, '10,20')).toBe(false);
+  });
+});
+
+describe('readBodyCapped', () => {
+  const streamOf = (...chunks: string[]) => {
+    const encoder = new TextEncoder();
+    return new ReadableStream<Uint8Array>({
+      start(controller) {
+        for (const chunk of chunks) controller.enqueue(encoder.encode(chunk));
+        controller.close();
+      },
+    });
+  };
+  const post = (body: BodyInit | null, headers: Record<string, string> = {}) =>
+    new Request('https://example.com/webhook', { method: 'POST', body, headers, duplex: 'half' } as RequestInit);
+
+  it('should read a chunked body without Content-Length', async () => {
+    const big = 'x'.repeat(40 * 1024);
+    expect(await readBodyCapped(post(streamOf('{"a":', big, '"}')), 1024 * 1024)).toBe(`{"a":${big}"}`);
+  });
+
+  it('should grow past an understated Content-Length', async () => {
+    const request = post(streamOf('hello ', 'سلام ', 'world'), { 'content-length': '4' });
+    expect(await readBodyCapped(request, 1024)).toBe('hello سلام world');
+  });
+
+  it('should return null once the body exceeds the cap', async () => {
+    expect(await readBodyCapped(post(streamOf('a'.repeat(60), 'b'.repeat(60))), 100)).toBeNull();
+  });
+
+  it('should return an empty string for an empty body', async () => {
+    expect(await readBodyCapped(post(null), 100)).toBe('');
+    expect(await readBodyCapped(post(''), 100)).toBe('');
+  });
+});